@@ -8,7 +8,7 @@ from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
 import tempfile
-from lease_analyzer import LeaseAnalyzer
+from lease_analyzer import LeaseAnalyzer, TRIAGE_MODEL, FULL_MODEL, MIN_TRIAGE_CONFIDENCE
 import json
 
 app = Flask(__name__)
@@ -21,7 +21,18 @@ MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
 # Initialize analyzer (use environment variable for API key)
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', 'your-api-key-here')
-analyzer = LeaseAnalyzer(api_key=ANTHROPIC_API_KEY)
+
+# Model cascade (set LEASE_TRIAGE_MODEL to an empty string to disable triage)
+LEASE_TRIAGE_MODEL = os.getenv('LEASE_TRIAGE_MODEL', TRIAGE_MODEL) or None
+LEASE_FULL_MODEL = os.getenv('LEASE_FULL_MODEL', FULL_MODEL)
+LEASE_MIN_TRIAGE_CONFIDENCE = int(os.getenv('LEASE_MIN_TRIAGE_CONFIDENCE', MIN_TRIAGE_CONFIDENCE))
+
+analyzer = LeaseAnalyzer(
+    api_key=ANTHROPIC_API_KEY,
+    triage_model=LEASE_TRIAGE_MODEL,
+    full_model=LEASE_FULL_MODEL,
+    min_triage_confidence=LEASE_MIN_TRIAGE_CONFIDENCE
+)
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -64,6 +75,12 @@ def analyze_lease():
         # Analyze with AI
         print("Analyzing lease with Claude AI...")
         analysis = analyzer.analyze_lease(lease_text)
+        routing = analysis.get('routing', {})
+        latencies = ', '.join(
+            f"{tier['tier']}={tier['latency_ms']}ms" for tier in routing.get('tiers', [])
+        )
+        print(f"Routing: escalated={routing.get('escalated')} "
+              f"reason={routing.get('reason')} ({latencies})")
         
         # Add safety score
         analysis['safety_score'] = analyzer.calculate_safety_score(analysis)
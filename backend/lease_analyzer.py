@@ -7,13 +7,31 @@ import anthropic
 import pdfplumber
 from pypdf import PdfReader
 import json
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import re
+import time
+
+# Model cascade: a small model triages every lease, the full model only
+# sees leases the triage pass could not confidently clear
+TRIAGE_MODEL = "claude-3-5-haiku-20241022"
+FULL_MODEL = "claude-sonnet-4-20250514"
+TRIAGE_MAX_TOKENS = 800
+FULL_MAX_TOKENS = 4000
+MIN_TRIAGE_CONFIDENCE = 80
+ESCALATION_RISK_LEVELS = {'MEDIUM', 'HIGH', 'CRITICAL'}
 
 class LeaseAnalyzer:
-    def __init__(self, api_key: str):
-        """Initialize with Anthropic API key"""
+    def __init__(self, api_key: str, triage_model: Optional[str] = TRIAGE_MODEL,
+                 full_model: str = FULL_MODEL,
+                 min_triage_confidence: int = MIN_TRIAGE_CONFIDENCE):
+        """
+        Initialize with Anthropic API key and model cascade settings.
+        Pass triage_model=None to send every lease straight to the full model.
+        """
         self.client = anthropic.Anthropic(api_key=api_key)
+        self.triage_model = triage_model
+        self.full_model = full_model
+        self.min_triage_confidence = min_triage_confidence
         
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract all text from PDF lease agreement"""
@@ -38,12 +56,128 @@ class LeaseAnalyzer:
         
         return text.strip()
     
+    def _request_json(self, model: str, max_tokens: int, prompt: str) -> Dict:
+        """Send a prompt to the given model and parse the JSON in its response"""
+        message = self.client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=0,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        
+        # Extract JSON from response
+        response_text = message.content[0].text
+        
+        # Try to find JSON in the response
+        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group())
+        return json.loads(response_text)
+    
+    def triage_lease(self, lease_text: str) -> Dict:
+        """
+        Quick first pass with the small model using a compact schema
+        Decides whether the lease needs the full detailed analysis
+        """
+        
+        prompt = f"""You are an expert housing lawyer specializing in Ontario tenant law. 
+Quickly screen this lease agreement for a student renting near the University of Ottawa.
+
+Flag the lease for detailed review if it contains ANY illegal clauses under the Ontario 
+Residential Tenancies Act, signs of a rental scam, unusual fees or deposits, or terms you 
+are unsure about. A clean Ontario Standard Form Lease with no problematic additions is LOW risk.
+
+LEASE AGREEMENT:
+{lease_text}
+
+Please respond in the following JSON format:
+{{
+    "overall_risk_level": "LOW/MEDIUM/HIGH/CRITICAL",
+    "confidence_score": 0-100,
+    "is_likely_scam": true/false,
+    "needs_detailed_review": true/false,
+    "good_points": [
+        "List of positive aspects of the lease"
+    ],
+    "overall_summary": "2-3 sentence summary of the lease",
+    "should_sign": "YES/NO/PROCEED_WITH_CAUTION",
+    "next_steps": "What the tenant should do next"
+}}"""
+
+        return self._request_json(self.triage_model, TRIAGE_MAX_TOKENS, prompt)
+    
+    def _escalation_reason(self, triage: Dict) -> Optional[str]:
+        """Return why a triaged lease needs the full model, or None if triage is enough"""
+        risk_level = str(triage.get('overall_risk_level', '')).upper()
+        if risk_level not in ESCALATION_RISK_LEVELS | {'LOW'}:
+            return 'unknown_risk_level'
+        if risk_level in ESCALATION_RISK_LEVELS:
+            return f'risk_{risk_level.lower()}'
+        if triage.get('is_likely_scam'):
+            return 'scam_suspect'
+        if triage.get('needs_detailed_review'):
+            return 'flagged_for_review'
+        try:
+            confidence = float(triage.get('confidence_score', 0))
+        except (TypeError, ValueError):
+            confidence = 0
+        if confidence < self.min_triage_confidence:
+            return 'low_confidence'
+        return None
+    
+    def _triage_to_analysis(self, triage: Dict) -> Dict:
+        """Expand a LOW risk triage result into the full analysis schema"""
+        return {
+            'overall_risk_level': 'LOW',
+            'confidence_score': triage.get('confidence_score', 0),
+            'is_likely_scam': False,
+            'scam_indicators': [],
+            'legal_violations': [],
+            'red_flags': [],
+            'concerning_clauses': [],
+            'missing_clauses': [],
+            'good_points': triage.get('good_points', []),
+            'financial_red_flags': [],
+            'recommendations': [],
+            'overall_summary': triage.get('overall_summary', 'No summary available'),
+            'should_sign': triage.get('should_sign', 'YES'),
+            'next_steps': triage.get('next_steps', 'Consult with a legal professional'),
+        }
+    
     def analyze_lease(self, lease_text: str) -> Dict:
         """
         Analyze lease agreement using Claude AI
-        Returns detailed analysis with red flags, scam indicators, and recommendations
+        Runs the triage model first and escalates to the full model when needed.
+        Returns detailed analysis with red flags, scam indicators, and recommendations,
+        plus a 'routing' entry recording the models used and per-tier latency
         """
         
+        routing = {'tiers': [], 'escalated': False, 'reason': None}
+        
+        if self.triage_model:
+            start = time.perf_counter()
+            try:
+                triage = self.triage_lease(lease_text)
+                reason = self._escalation_reason(triage)
+            except Exception as e:
+                print(f"Triage failed: {e}, escalating to full model...")
+                reason = 'triage_failed'
+            routing['tiers'].append({
+                'tier': 'triage',
+                'model': self.triage_model,
+                'latency_ms': round((time.perf_counter() - start) * 1000),
+            })
+            
+            if reason is None:
+                analysis = self._triage_to_analysis(triage)
+                analysis['routing'] = routing
+                return analysis
+            
+            routing['escalated'] = True
+            routing['reason'] = reason
+        
         prompt = f"""You are an expert housing lawyer specializing in Ontario tenant law and lease agreements. 
 Analyze this lease agreement for a student renting near the University of Ottawa. 
 
@@ -133,24 +267,14 @@ Please respond in the following JSON format:
 }}"""
 
         try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4000,
-                temperature=0,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            # Extract JSON from response
-            response_text = message.content[0].text
-            
-            # Try to find JSON in the response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                analysis = json.loads(json_match.group())
-            else:
-                analysis = json.loads(response_text)
+            start = time.perf_counter()
+            analysis = self._request_json(self.full_model, FULL_MAX_TOKENS, prompt)
+            routing['tiers'].append({
+                'tier': 'full',
+                'model': self.full_model,
+                'latency_ms': round((time.perf_counter() - start) * 1000),
+            })
+            analysis['routing'] = routing
             
             return analysis
             
@@ -2,11 +2,16 @@
 """
 Create a GIF from README screenshots.
 Downloads images from GitHub user-attachments and combines them into a single GIF.
+Downloads are cached locally, so later runs only revalidate (or work fully offline).
 Requires: pip install pillow requests
 """
 
+import argparse
+import hashlib
 import io
+import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -34,15 +39,68 @@ IMAGE_URLS = [
 MAX_WIDTH = 800  # Resize to keep GIF file size reasonable
 DURATION = 2000  # ms per frame
 OUTPUT_PATH = Path(__file__).resolve().parent.parent / "docs" / "screenshots.gif"
-
-
-def download_image(url: str) -> Image.Image:
-    """Download image from URL and return as PIL Image."""
-    headers = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
-    resp = requests.get(url, headers=headers, timeout=30)
-    resp.raise_for_status()
-    img = Image.open(io.BytesIO(resp.content))
-    if img.mode in ("RGBA", "P"):
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "screenshots"
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp"}
+HEADERS = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
+TIMEOUT = 30
+MAX_WORKERS = 8
+PALETTE_COLORS = 256
+PALETTE_SAMPLE_WIDTH = 200  # Frames are downscaled to this width to build the shared palette
+BACKGROUND = (255, 255, 255)
+
+
+def cache_paths(url: str, cache_dir: Path) -> tuple[Path, Path]:
+    """Return (image file, metadata file) paths for a cached URL."""
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"{key}.img", cache_dir / f"{key}.json"
+
+
+def fetch_image_bytes(url: str, cache_dir: Path, offline: bool = False) -> bytes:
+    """
+    Return image bytes for a URL, using the local cache when possible.
+    Cached entries are revalidated with ETag/Last-Modified; a 304 (or a network
+    error) reuses the cached copy. In offline mode only the cache is used.
+    """
+    data_path, meta_path = cache_paths(url, cache_dir)
+    cached = data_path.exists()
+    meta = json.loads(meta_path.read_text()) if cached and meta_path.exists() else {}
+
+    if offline:
+        if not cached:
+            raise FileNotFoundError(f"Not in cache (run once online first): {url}")
+        return data_path.read_bytes()
+
+    headers = dict(HEADERS)
+    if cached:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        resp = requests.get(url, headers=headers, timeout=TIMEOUT)
+        if resp.status_code == 304 and cached:
+            return data_path.read_bytes()
+        resp.raise_for_status()
+    except requests.RequestException:
+        if cached:
+            return data_path.read_bytes()
+        raise
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    data_path.write_bytes(resp.content)
+    meta_path.write_text(json.dumps({
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }))
+    return resp.content
+
+
+def open_image(data: bytes) -> Image.Image:
+    """Decode image bytes into an RGB PIL Image."""
+    img = Image.open(io.BytesIO(data))
+    if img.mode != "RGB":
         return img.convert("RGB")
     return img
 
@@ -56,36 +114,109 @@ def resize_for_gif(img: Image.Image) -> Image.Image:
     return img.resize(new_size, Image.Resampling.LANCZOS)
 
 
-def main():
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-    frames = []
-    for i, url in enumerate(IMAGE_URLS):
-        print(f"Downloading image {i + 1}/{len(IMAGE_URLS)}...")
-        try:
-            img = download_image(url)
-        except Exception as e:
-            print(f"  Error: {e}")
-            continue
-        img = resize_for_gif(img)
-        frames.append(img)
-
-    if not frames:
-        print("No images downloaded. Exiting.")
-        sys.exit(1)
+def load_frame(source, cache_dir: Path, offline: bool) -> Image.Image:
+    """Load one screenshot (URL or local path) and resize it for the GIF."""
+    if isinstance(source, Path):
+        data = source.read_bytes()
+    else:
+        data = fetch_image_bytes(source, cache_dir, offline)
+    return resize_for_gif(open_image(data))
+
 
+def pad_to_canvas(img: Image.Image, size: tuple[int, int]) -> Image.Image:
+    """Place image on a common-sized canvas so consecutive frames can be diffed."""
+    if img.size == size:
+        return img
+    canvas = Image.new("RGB", size, BACKGROUND)
+    canvas.paste(img, (0, 0))
+    return canvas
+
+
+def build_shared_palette(frames: list[Image.Image]) -> Image.Image:
+    """Quantize a downscaled montage of all frames into one palette shared by every frame."""
+    thumbs = []
+    for frame in frames:
+        ratio = PALETTE_SAMPLE_WIDTH / frame.width
+        thumbs.append(frame.resize(
+            (PALETTE_SAMPLE_WIDTH, max(1, int(frame.height * ratio))),
+            Image.Resampling.BILINEAR,
+        ))
+    montage = Image.new("RGB", (PALETTE_SAMPLE_WIDTH, sum(t.height for t in thumbs)))
+    y = 0
+    for thumb in thumbs:
+        montage.paste(thumb, (0, y))
+        y += thumb.height
+    return montage.quantize(colors=PALETTE_COLORS, method=Image.Quantize.MEDIANCUT)
+
+
+def quantize_frame(img: Image.Image, palette: Image.Image) -> Image.Image:
+    """
+    Map a frame onto the shared palette. Dithering is off so unchanged regions
+    map to identical indices, which keeps the per-frame difference boxes tight.
+    """
+    return img.quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--image-dir", type=Path,
+                        help="Use local screenshots from this directory (sorted by name) instead of IMAGE_URLS")
+    parser.add_argument("--offline", action="store_true",
+                        help="Never hit the network; use only cached downloads")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR,
+                        help=f"Download cache directory (default: {CACHE_DIR})")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"Parallel download/resize workers (default: {MAX_WORKERS})")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH,
+                        help=f"Output GIF path (default: {OUTPUT_PATH})")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+
+    if args.image_dir:
+        sources = sorted(p for p in args.image_dir.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+    else:
+        sources = list(IMAGE_URLS)
+
+    print(f"Loading {len(sources)} images with {args.workers} workers...")
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(load_frame, src, args.cache_dir, args.offline) for src in sources]
+
+        frames = []
+        for i, future in enumerate(futures):
+            try:
+                frames.append(future.result())
+            except Exception as e:
+                print(f"  Error loading image {i + 1}/{len(sources)}: {e}")
+
+        if not frames:
+            print("No images downloaded. Exiting.")
+            sys.exit(1)
+
+        print(f"Quantizing {len(frames)} frames to a shared palette...")
+        canvas_size = (max(f.width for f in frames), max(f.height for f in frames))
+        frames = list(pool.map(lambda f: pad_to_canvas(f, canvas_size), frames))
+        palette = build_shared_palette(frames)
+        frames = list(pool.map(lambda f: quantize_frame(f, palette), frames))
+
+    # With a common canvas and palette, Pillow only stores the changed
+    # bounding box of each frame relative to the previous one.
     print(f"Creating GIF with {len(frames)} frames...")
     frames[0].save(
-        OUTPUT_PATH,
+        args.output,
         save_all=True,
         append_images=frames[1:],
         duration=DURATION,
         loop=0,
         optimize=True,
+        disposal=1,
     )
 
-    size_mb = OUTPUT_PATH.stat().st_size / (1024 * 1024)
-    print(f"Done! Saved to {OUTPUT_PATH} ({size_mb:.2f} MB)")
+    size_mb = args.output.stat().st_size / (1024 * 1024)
+    print(f"Done! Saved to {args.output} ({size_mb:.2f} MB)")
 
 
 if __name__ == "__main__":